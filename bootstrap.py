@@ -0,0 +1,31 @@
+"""
+Shared start-up helpers for the run scripts.
+"""
+
+import logging
+from pathlib import Path
+
+logger = logging.getLogger("bootstrap")
+
+ENV_FILE = Path('.env')
+ENV_EXAMPLE_FILE = Path('.env.example')
+
+def ensure_env_file() -> bool:
+    """Make sure a .env file exists, copying it from .env.example if needed.
+
+    Returns True if the .env file was created from the example, False if it
+    already existed. Raises FileNotFoundError if neither file exists.
+    """
+    if ENV_FILE.exists():
+        return False
+
+    if not ENV_EXAMPLE_FILE.exists():
+        raise FileNotFoundError("No .env or .env.example file found")
+
+    logger.warning("No .env file found. Copying from .env.example...")
+
+    # Copy .env.example to .env
+    ENV_FILE.write_text(ENV_EXAMPLE_FILE.read_text())
+
+    logger.info("Created .env file from example. Please edit it with your configuration.")
+    return True
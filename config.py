@@ -1,37 +1,73 @@
 import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple
+
 import dotenv
 
-# Load environment variables from .env file
-dotenv.load_dotenv()
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Immutable snapshot of the application configuration."""
+    # Server configuration
+    SERVER_HOST: str
+    SERVER_PORT: int
+
+    # Agent configuration
+    AGENT_NAME: str
+
+    # Azure OpenAI configuration
+    AZURE_OPENAI_API_KEY: str
+    AZURE_OPENAI_ENDPOINT: str
+    AZURE_OPENAI_API_VERSION: str
+    AZURE_OPENAI_DEPLOYMENT_NAME: str
+
+    # Connection settings
+    SERVER_ADDRESS: str
 
-# Server configuration
-SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
-SERVER_PORT = int(os.getenv("SERVER_PORT", "8765"))
+    # Required variables that were not set
+    missing: Tuple[str, ...]
 
-# Agent configuration
-AGENT_NAME = os.getenv("AGENT_NAME", "Agent_Default")
+@lru_cache(maxsize=1)
+def _load() -> Config:
+    """Load the configuration once and cache it for the lifetime of the process."""
+    # Load environment variables from .env file
+    dotenv.load_dotenv()
 
-# Azure OpenAI configuration
-AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_API_KEY", "")
-AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT", "")
-AZURE_OPENAI_API_VERSION = os.getenv("AZURE_OPENAI_API_VERSION", "2023-05-15")
-AZURE_OPENAI_DEPLOYMENT_NAME = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "")
+    server_host = os.getenv("SERVER_HOST", "0.0.0.0")
+    server_port = int(os.getenv("SERVER_PORT", "8765"))
 
-# Connection settings
-SERVER_ADDRESS = os.getenv("SERVER_ADDRESS", f"http://{SERVER_HOST}:{SERVER_PORT}")
+    values = {
+        "SERVER_HOST": server_host,
+        "SERVER_PORT": server_port,
+        "AGENT_NAME": os.getenv("AGENT_NAME", "Agent_Default"),
+        "AZURE_OPENAI_API_KEY": os.getenv("AZURE_OPENAI_API_KEY", ""),
+        "AZURE_OPENAI_ENDPOINT": os.getenv("AZURE_OPENAI_ENDPOINT", ""),
+        "AZURE_OPENAI_API_VERSION": os.getenv("AZURE_OPENAI_API_VERSION", "2023-05-15"),
+        "AZURE_OPENAI_DEPLOYMENT_NAME": os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", ""),
+        "SERVER_ADDRESS": os.getenv("SERVER_ADDRESS", f"http://{server_host}:{server_port}"),
+    }
+
+    # Check the required variables once, while loading
+    missing = tuple(
+        name for name in (
+            "AZURE_OPENAI_API_KEY",
+            "AZURE_OPENAI_ENDPOINT",
+            "AZURE_OPENAI_DEPLOYMENT_NAME",
+        )
+        if not values[name]
+    )
+
+    return Config(missing=missing, **values)
+
+def __getattr__(name: str):
+    """Expose configuration values as module attributes, e.g. config.SERVER_HOST."""
+    if name.isupper() and name in Config.__dataclass_fields__:
+        return getattr(_load(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def validate_config():
     """Validate that all required configuration variables are set."""
-    missing = []
-    
-    if not AZURE_OPENAI_API_KEY:
-        missing.append("AZURE_OPENAI_API_KEY")
-    
-    if not AZURE_OPENAI_ENDPOINT:
-        missing.append("AZURE_OPENAI_ENDPOINT")
-    
-    if not AZURE_OPENAI_DEPLOYMENT_NAME:
-        missing.append("AZURE_OPENAI_DEPLOYMENT_NAME")
-    
+    missing = _load().missing
+
     if missing:
-        raise ValueError(f"Missing required configuration variables: {', '.join(missing)}") 
\ No newline at end of file
+        raise ValueError(f"Missing required configuration variables: {', '.join(missing)}")
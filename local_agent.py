@@ -2,10 +2,12 @@ import asyncio
 import json
 import logging
 import os
-import random
 import sys
-from typing import Dict, List, Optional
+import uuid
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
+import aioconsole
 import autogen
 from autogen import AssistantAgent, UserProxyAgent, config_list_from_json
 
@@ -17,6 +19,29 @@ logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("local_agent")
 
+# Maximum number of incoming messages waiting for the user
+MAX_PENDING_MESSAGES = 256
+
+# System prompt for the assistant agent, formatted with the agent's id
+SYSTEM_MESSAGE_TMPL = """You are an AI assistant named {agent_id} that can communicate with other AI agents.
+Your goal is to help your user by collaborating with other agents when necessary.
+Keep responses helpful, concise, and relevant to the user's needs."""
+
+@lru_cache(maxsize=1)
+def _llm_config() -> Dict:
+    """Build the Autogen LLM configuration for Azure OpenAI once."""
+    config_list = [{
+        "model": config.AZURE_OPENAI_DEPLOYMENT_NAME,
+        "api_key": config.AZURE_OPENAI_API_KEY,
+        "base_url": f"{config.AZURE_OPENAI_ENDPOINT}",
+        "api_version": config.AZURE_OPENAI_API_VERSION,
+        "api_type": "azure",
+    }]
+    
+    return {
+        "config_list": config_list,
+    }
+
 class RemoteAgentConnector:
     """Connects the local Autogen agent with remote agents via SSE."""
     
@@ -25,8 +50,12 @@ class RemoteAgentConnector:
         self.sse_client = SSEClient(agent_id, config.SERVER_ADDRESS)
         self.user_proxy: Optional[UserProxyAgent] = None
         self.assistant: Optional[AssistantAgent] = None
-        self.message_queue = asyncio.Queue()
+        self.message_queue = asyncio.Queue(maxsize=MAX_PENDING_MESSAGES)
         self.running = False
+        # Console prompts waiting for a line; the most recent one is answered first
+        self._prompts: List[Tuple[str, asyncio.Future]] = []
+        # Single task that owns all reads from stdin
+        self._console_task: Optional[asyncio.Task] = None
     
     async def setup(self):
         """Set up the SSE connection and autogen agents."""
@@ -39,37 +68,23 @@ class RemoteAgentConnector:
         # Add message handler
         self.sse_client.add_message_handler(self.handle_incoming_message)
         
-        # Start listening for messages
-        await self.sse_client.start_listening()
-        
-        # Set up Autogen agents
-        self.setup_agents()
+        # Start listening for messages while the Autogen agents are
+        # constructed in a worker thread
+        await asyncio.gather(
+            self.sse_client.start_listening(),
+            asyncio.to_thread(self.setup_agents),
+        )
         
         self.running = True
         return True
     
     def setup_agents(self):
         """Set up Autogen agents with Azure OpenAI."""
-        # Configure Azure OpenAI
-        config_list = [{
-            "model": config.AZURE_OPENAI_DEPLOYMENT_NAME,
-            "api_key": config.AZURE_OPENAI_API_KEY,
-            "base_url": f"{config.AZURE_OPENAI_ENDPOINT}",
-            "api_version": config.AZURE_OPENAI_API_VERSION,
-            "api_type": "azure",
-        }]
-        
-        llm_config = {
-            "config_list": config_list,
-        }
-        
         # Create an assistant agent
         self.assistant = AssistantAgent(
             name=self.agent_id,
-            llm_config=llm_config,
-            system_message=f"""You are an AI assistant named {self.agent_id} that can communicate with other AI agents.
-Your goal is to help your user by collaborating with other agents when necessary.
-Keep responses helpful, concise, and relevant to the user's needs."""
+            llm_config=_llm_config(),
+            system_message=SYSTEM_MESSAGE_TMPL.format(agent_id=self.agent_id)
         )
         
         # Create a user proxy agent
@@ -79,6 +94,43 @@ Keep responses helpful, concise, and relevant to the user's needs."""
             code_execution_config={"use_docker": False},
         )
     
+    async def prompt(self, text: str) -> str:
+        """Ask the user for a line of console input without blocking the event loop.
+        
+        All reads go through one console task, since stdin cannot be read by
+        two coroutines at once. If several prompts are pending, the newest one
+        receives the next line and the previous prompt is shown again.
+        """
+        future = asyncio.get_running_loop().create_future()
+        entry = (text, future)
+        self._prompts.append(entry)
+        print(text, end='', flush=True)
+        
+        if self._console_task is None or self._console_task.done():
+            self._console_task = asyncio.create_task(self._read_console())
+        
+        try:
+            return await future
+        finally:
+            if entry in self._prompts:
+                self._prompts.remove(entry)
+    
+    async def _read_console(self):
+        """Read lines from stdin and hand each one to the newest pending prompt."""
+        while self._prompts:
+            line = await aioconsole.ainput()
+            
+            # Answer the newest prompt that is still waiting
+            while self._prompts:
+                _, future = self._prompts.pop()
+                if not future.done():
+                    future.set_result(line)
+                    break
+            
+            # Show the prompt that is now waiting again
+            if self._prompts:
+                print(self._prompts[-1][0], end='', flush=True)
+    
     async def handle_incoming_message(self, data: Dict):
         """Handle incoming SSE messages."""
         if data.get('type') == 'message':
@@ -88,18 +140,27 @@ Keep responses helpful, concise, and relevant to the user's needs."""
             if not sender_id or not content:
                 return
             
-            # Add to message queue for processing
-            await self.message_queue.put({
+            item = {
                 'sender': sender_id,
                 'content': content
-            })
+            }
+            
+            # Add to message queue for processing, dropping the oldest
+            # pending message when the user has fallen behind
+            try:
+                self.message_queue.put_nowait(item)
+            except asyncio.QueueFull:
+                self.message_queue.get_nowait()
+                self.message_queue.task_done()
+                logger.warning("Message queue full, dropped the oldest pending message")
+                self.message_queue.put_nowait(item)
     
     async def process_messages(self):
         """Process incoming messages from the queue."""
         while self.running:
+            message = await self.message_queue.get()
+            
             try:
-                message = await self.message_queue.get()
-                
                 sender = message['sender']
                 content = message['content']
                 
@@ -109,7 +170,7 @@ Keep responses helpful, concise, and relevant to the user's needs."""
                 print("===========================\n")
                 
                 # Allow the user to respond
-                response = input("Enter your response (or 'skip' to ignore): ")
+                response = await self.prompt("Enter your response (or 'skip' to ignore): ")
                 
                 if response.lower() != 'skip':
                     # Send the response through the assistant
@@ -125,11 +186,12 @@ Keep responses helpful, concise, and relevant to the user's needs."""
                     
                     # Send the response back
                     await self.send_message(last_message)
-                
-                self.message_queue.task_done()
             
             except Exception as e:
                 logger.error(f"Error processing message: {e}")
+            
+            finally:
+                self.message_queue.task_done()
     
     async def send_message(self, message: str) -> bool:
         """Send a message to all other agents."""
@@ -143,7 +205,7 @@ Keep responses helpful, concise, and relevant to the user's needs."""
     async def start_conversation(self):
         """Start a conversation by broadcasting a message to all other agents."""
         # Get message from user
-        user_input = input("\nEnter your message to broadcast to all agents: ")
+        user_input = await self.prompt("\nEnter your message to broadcast to all agents: ")
         
         # Process through assistant
         conversation = self.assistant.initiate_chat(
@@ -181,7 +243,7 @@ Keep responses helpful, concise, and relevant to the user's needs."""
                 print("2. List connected agents")
                 print("3. Exit")
                 
-                choice = await asyncio.to_thread(input, "\nEnter your choice (1-3): ")
+                choice = await self.prompt("\nEnter your choice (1-3): ")
                 
                 if choice == '1':
                     await self.start_conversation()
@@ -205,6 +267,8 @@ Keep responses helpful, concise, and relevant to the user's needs."""
             # Clean up
             self.running = False
             message_processor.cancel()
+            if self._console_task is not None:
+                self._console_task.cancel()
             await self.sse_client.close()
 
 async def main():
@@ -217,9 +281,9 @@ async def main():
     
     # Create and run the connector
 
-    #get random id for agent_id
-    agent_id = random.randint(1000, 9999)
-    connector = RemoteAgentConnector(str(agent_id))
+    # Use a random, practically collision-free id for the agent
+    agent_id = uuid.uuid4().hex[:12]
+    connector = RemoteAgentConnector(agent_id)
     await connector.run()
 
 if __name__ == "__main__":
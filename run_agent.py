@@ -3,11 +3,12 @@
 Run script for the local AI agent component that uses Azure OpenAI.
 """
 
-import os
 import sys
 import logging
 import asyncio
 
+from bootstrap import ensure_env_file
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -15,28 +16,20 @@ logger = logging.getLogger("run_agent")
 
 async def main():
     # Check if .env file exists
-    if not os.path.exists('.env'):
-        if os.path.exists('.env.example'):
-            logger.warning("No .env file found. Copying from .env.example...")
-            
-            # Copy .env.example to .env
-            with open('.env.example', 'r') as example_file:
-                example_content = example_file.read()
-            
-            with open('.env', 'w') as env_file:
-                env_file.write(example_content)
-            
-            logger.info("Created .env file from example. Please edit it with your configuration.")
-            logger.info("Please set your AZURE_OPENAI_API_KEY and other settings in the .env file.")
-            
-            # Prompt user to update the .env file
-            user_input = input("Would you like to proceed with default settings? (y/n): ")
-            if user_input.lower() != 'y':
-                logger.info("Please update the .env file and run the script again.")
-                sys.exit(0)
-        else:
-            logger.error("No .env or .env.example file found. Please create a .env file.")
-            sys.exit(1)
+    try:
+        created = ensure_env_file()
+    except FileNotFoundError:
+        logger.error("No .env or .env.example file found. Please create a .env file.")
+        sys.exit(1)
+    
+    if created:
+        logger.info("Please set your AZURE_OPENAI_API_KEY and other settings in the .env file.")
+        
+        # Prompt user to update the .env file
+        user_input = input("Would you like to proceed with default settings? (y/n): ")
+        if user_input.lower() != 'y':
+            logger.info("Please update the .env file and run the script again.")
+            sys.exit(0)
     
     # Check for Azure OpenAI configuration
     from config import AZURE_OPENAI_API_KEY, AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_DEPLOYMENT_NAME
@@ -8,6 +8,8 @@ import os
 import sys
 import logging
 
+from bootstrap import ensure_env_file
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -15,20 +17,10 @@ logger = logging.getLogger("run_server")
 
 def main():
     # Check if .env file exists (for local development)
-    if not os.path.exists('.env'):
-        if os.path.exists('.env.example'):
-            logger.warning("No .env file found. Copying from .env.example...")
-            
-            # Copy .env.example to .env
-            with open('.env.example', 'r') as example_file:
-                example_content = example_file.read()
-            
-            with open('.env', 'w') as env_file:
-                env_file.write(example_content)
-            
-            logger.info("Created .env file from example. Please edit it with your configuration.")
-        else:
-            logger.warning("No .env or .env.example file found. Will try to use environment variables directly.")
+    try:
+        ensure_env_file()
+    except FileNotFoundError:
+        logger.warning("No .env or .env.example file found. Will try to use environment variables directly.")
     
     # Check for Azure environment variables
     if 'APPSETTING_WEBSITE_SITE_NAME' in os.environ:
@@ -1,26 +1,64 @@
 import asyncio
+import heapq
 import json
 import logging
 import time
-from typing import Dict, List, Set
+from collections import deque
+from typing import Deque, Dict, List, Set, Tuple
 
 from aiohttp import web
 from aiohttp.web import Request, Response, json_response
 
 import config
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("agent_server")
 
+# SSE framing
+DATA_PREFIX = b"data: "
+FRAME_SUFFIX = b"\n\n"
+PING_FRAME = b": ping\n\n"
+
 # In-memory message storage
-# Maps agent_id to list of messages
-message_queues: Dict[str, List[Dict]] = {}
-# Maps agent_id to a set of response objects for SSE connections
-sse_connections: Dict[str, Set[web.StreamResponse]] = {}
-# Maps agent_id to last seen timestamp
+# Maximum number of messages kept for an agent without a live connection
+MAX_QUEUED_MESSAGES = 1024
+# Maps agent_id to a bounded queue of encoded SSE frames (oldest dropped first)
+message_queues: Dict[str, Deque[bytes]] = {}
+# Maps agent_id to a list of response objects for SSE connections
+sse_connections: Dict[str, List[web.StreamResponse]] = {}
+# Agents with at least one live SSE connection
+live_subscribers: Set[str] = set()
+# Maps agent_id to last seen time on the event loop's monotonic clock
 agent_last_seen: Dict[str, float] = {}
+# Min-heap of (last_seen, agent_id); entries older than agent_last_seen are stale
+_expiry_heap: List[Tuple[float, str]] = []
+
+def loop_time() -> float:
+    """Return the running event loop's monotonic clock, used for last-seen times."""
+    return asyncio.get_running_loop().time()
+
+def dumps(obj) -> bytes:
+    """Serialize obj to compact JSON bytes, using orjson when available."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            # e.g. integers outside the 64-bit range, which json accepts
+            pass
+    return json.dumps(obj, separators=(",", ":")).encode('utf-8')
+
+def touch_agent(agent_id: str):
+    """Record that an agent was just seen."""
+    now = loop_time()
+    agent_last_seen[agent_id] = now
+    heapq.heappush(_expiry_heap, (now, agent_id))
 
 async def register_agent(request: Request) -> Response:
     """Register an agent with the server."""
@@ -31,12 +69,15 @@ async def register_agent(request: Request) -> Response:
         if not agent_id:
             return json_response({'error': 'Missing agent_id'}, status=400)
         
-        # Initialize message queue if needed
-        if agent_id not in message_queues:
-            message_queues[agent_id] = []
-            sse_connections[agent_id] = set()
+        # Refuse to hand out another agent's message queue
+        if agent_id in message_queues:
+            return json_response({'error': f'Agent {agent_id} is already registered'}, status=409)
         
-        agent_last_seen[agent_id] = time.time()
+        # Initialize message queue
+        message_queues[agent_id] = deque(maxlen=MAX_QUEUED_MESSAGES)
+        sse_connections[agent_id] = []
+        
+        touch_agent(agent_id)
         logger.info(f"Agent {agent_id} registered")
         
         return json_response({'status': 'registered', 'agent_id': agent_id})
@@ -56,7 +97,7 @@ async def send_message(request: Request) -> Response:
             return json_response({'error': 'Missing sender_id or content'}, status=400)
         
         # Update last seen timestamp
-        agent_last_seen[sender_id] = time.time()
+        touch_agent(sender_id)
         
         # Create message
         message = {
@@ -66,19 +107,47 @@ async def send_message(request: Request) -> Response:
             'timestamp': time.time()
         }
         
-        # Broadcast to all agents except sender
-        for agent_id in message_queues.keys():
-            if agent_id != sender_id:
-                # Add to message queue
-                message_queues[agent_id].append(message)
+        # Encode the SSE frame once and reuse it for every recipient
+        frame = DATA_PREFIX + dumps(message) + FRAME_SUFFIX
+        
+        # Broadcast to all connected agents except sender
+        recipients = []
+        writes = []
+        for agent_id in live_subscribers:
+            if agent_id == sender_id:
+                continue
+            for connection in sse_connections[agent_id]:
+                recipients.append((agent_id, connection))
+                writes.append(connection.write(frame))
+        
+        # Queue the encoded frame for agents without a live connection
+        for agent_id, queue in message_queues.items():
+            if agent_id != sender_id and agent_id not in live_subscribers:
+                queue.append(frame)
+        
+        # Fan out concurrently so one slow client does not hold up the others
+        results = await asyncio.gather(*writes, return_exceptions=True)
+        delivered = set()
+        failed = set()
+        for (agent_id, connection), result in zip(recipients, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error sending SSE message to {agent_id}: {result}")
+                failed.add(agent_id)
                 
-                # Send to all active SSE connections for this agent
-                for connection in sse_connections.get(agent_id, set()):
-                    try:
-                        await connection.write(f"data: {json.dumps(message)}\n\n".encode('utf-8'))
-                        await connection.drain()
-                    except Exception as e:
-                        logger.error(f"Error sending SSE message to {agent_id}: {e}")
+                # Drop the dead connection so later broadcasts queue instead
+                connections = sse_connections.get(agent_id)
+                if connections is not None and connection in connections:
+                    connections.remove(connection)
+                    if not connections:
+                        live_subscribers.discard(agent_id)
+            else:
+                delivered.add(agent_id)
+        
+        # Queue the frame for agents none of whose connections received it,
+        # so it is replayed when they reconnect
+        for agent_id in failed - delivered:
+            if agent_id in message_queues:
+                message_queues[agent_id].append(frame)
         
         logger.info(f"Message from {sender_id} broadcast to {len(message_queues) - 1} agents")
         return json_response({'status': 'sent'})
@@ -96,11 +165,11 @@ async def events(request: Request) -> web.StreamResponse:
     
     # Initialize message queue if needed
     if agent_id not in message_queues:
-        message_queues[agent_id] = []
-        sse_connections[agent_id] = set()
+        message_queues[agent_id] = deque(maxlen=MAX_QUEUED_MESSAGES)
+        sse_connections[agent_id] = []
     
     # Update last seen timestamp
-    agent_last_seen[agent_id] = time.time()
+    touch_agent(agent_id)
     
     # Set up SSE response
     response = web.StreamResponse()
@@ -109,28 +178,40 @@ async def events(request: Request) -> web.StreamResponse:
     response.headers['Connection'] = 'keep-alive'
     await response.prepare(request)
     
-    # Add to active connections
-    sse_connections[agent_id].add(response)
+    stop_event: asyncio.Event = request.app['stop_event']
     
     try:
-        # Send any waiting messages
-        for message in message_queues[agent_id]:
-            await response.write(f"data: {json.dumps(message)}\n\n".encode('utf-8'))
-            await response.drain()
+        # Send any waiting messages, removing each one once it is written.
+        # Broadcasts arriving meanwhile are queued behind them, since the
+        # agent is not yet a live subscriber.
+        queue = message_queues[agent_id]
+        while queue:
+            frame = queue[0]
+            await response.write(frame)
+            
+            # Remove the frame only once written; a concurrent append to a
+            # full queue may already have evicted it
+            if queue and queue[0] is frame:
+                queue.popleft()
         
-        # Clear the message queue after sending
-        message_queues[agent_id] = []
+        # Add to active connections once the backlog has been replayed
+        sse_connections[agent_id].append(response)
+        live_subscribers.add(agent_id)
         
         # Keep connection alive
         while True:
             # Send a ping message every 30 seconds to keep the connection alive
-            await response.write(b": ping\n\n")
-            await response.drain()
+            await response.write(PING_FRAME)
             
             # Update last seen timestamp
-            agent_last_seen[agent_id] = time.time()
+            touch_agent(agent_id)
             
-            await asyncio.sleep(30)
+            # Wait for the next ping, or exit promptly on shutdown
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=30)
+                break
+            except asyncio.TimeoutError:
+                pass
     
     except ConnectionResetError:
         logger.info(f"SSE connection closed for {agent_id}")
@@ -140,6 +221,8 @@ async def events(request: Request) -> web.StreamResponse:
         # Remove from active connections
         if agent_id in sse_connections and response in sse_connections[agent_id]:
             sse_connections[agent_id].remove(response)
+            if not sse_connections[agent_id]:
+                live_subscribers.discard(agent_id)
         
         return response
 
@@ -153,13 +236,16 @@ async def list_agents(request: Request) -> Response:
 
 def cleanup_inactive_agents(max_idle_time=300):  # 5 minutes
     """Clean up agents that haven't been seen for a while."""
-    current_time = time.time()
-    inactive_agents = [
-        agent_id for agent_id, last_seen in agent_last_seen.items()
-        if current_time - last_seen > max_idle_time
-    ]
+    current_time = loop_time()
     
-    for agent_id in inactive_agents:
+    # Pop expired entries oldest first, stopping at the first fresh one
+    while _expiry_heap and current_time - _expiry_heap[0][0] > max_idle_time:
+        last_seen, agent_id = heapq.heappop(_expiry_heap)
+        
+        # Skip stale entries for agents that have been seen since
+        if agent_last_seen.get(agent_id) != last_seen:
+            continue
+        
         if agent_id in message_queues:
             del message_queues[agent_id]
         if agent_id in sse_connections:
@@ -170,6 +256,7 @@ def cleanup_inactive_agents(max_idle_time=300):  # 5 minutes
                 except Exception:
                     pass
             del sse_connections[agent_id]
+        live_subscribers.discard(agent_id)
         if agent_id in agent_last_seen:
             del agent_last_seen[agent_id]
         
@@ -189,11 +276,16 @@ async def cleanup_task(app):
 
 async def on_startup(app):
     logger.info(f"Server starting on {config.SERVER_HOST}:{config.SERVER_PORT}")
+    app['stop_event'] = asyncio.Event()
     app['cleanup_task'] = asyncio.create_task(cleanup_task(app))
 
 async def on_shutdown(app):
     logger.info("Server shutting down")
     
+    # Wake up SSE handlers so they stop sending pings and return
+    if 'stop_event' in app:
+        app['stop_event'].set()
+    
     # Cancel cleanup task
     if 'cleanup_task' in app:
         app['cleanup_task'].cancel()
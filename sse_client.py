@@ -9,6 +9,36 @@ import config
 
 logger = logging.getLogger("sse_client")
 
+# Maximum time start_listening waits for the SSE stream to open
+READY_TIMEOUT = 5
+
+# HTTP session shared by every SSEClient in the process
+_SESSION: Optional[aiohttp.ClientSession] = None
+# Number of SSEClient instances currently holding the shared session
+_SESSION_REFS = 0
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Return the shared client session, creating it on first use."""
+    global _SESSION, _SESSION_REFS
+    
+    if _SESSION is None or _SESSION.closed:
+        connector = aiohttp.TCPConnector(limit=0, ttl_dns_cache=300, keepalive_timeout=75)
+        _SESSION = aiohttp.ClientSession(connector=connector)
+        _SESSION_REFS = 0
+    
+    _SESSION_REFS += 1
+    return _SESSION
+
+async def _release_session():
+    """Release a reference to the shared session, closing it after the last one."""
+    global _SESSION, _SESSION_REFS
+    
+    _SESSION_REFS -= 1
+    if _SESSION_REFS <= 0 and _SESSION is not None:
+        await _SESSION.close()
+        _SESSION = None
+        _SESSION_REFS = 0
+
 class SSEClient:
     """Client for Server-Sent Events communication with the server."""
     
@@ -21,11 +51,13 @@ class SSEClient:
         self.is_listening = False
         self.message_handlers: List[Callable] = []
         self.sse_task = None
+        # Set once the SSE stream has been opened successfully
+        self._ready = asyncio.Event()
     
     async def register(self) -> bool:
         """Register the agent with the server."""
         if self.session is None:
-            self.session = aiohttp.ClientSession()
+            self.session = await _get_session()
         
         try:
             url = f"{self.base_url}/register"
@@ -54,7 +86,7 @@ class SSEClient:
             return False
         
         if self.session is None:
-            self.session = aiohttp.ClientSession()
+            self.session = await _get_session()
         
         try:
             url = f"{self.base_url}/send"
@@ -80,7 +112,7 @@ class SSEClient:
     async def list_agents(self) -> List[str]:
         """Get a list of all connected agents."""
         if self.session is None:
-            self.session = aiohttp.ClientSession()
+            self.session = await _get_session()
         
         try:
             url = f"{self.base_url}/agents"
@@ -100,13 +132,14 @@ class SSEClient:
         """Add a handler function for incoming messages."""
         self.message_handlers.append(handler)
     
-    async def _process_sse_event(self, event: str):
+    async def _process_sse_event(self, event: bytes):
         """Process an SSE event."""
         if not event or not event.strip():
             return
         
         try:
-            # Parse the event data
+            # Parse the event data; json.loads accepts UTF-8 bytes directly and,
+            # unlike orjson, keeps integers wider than 64 bits exact
             data = json.loads(event)
             
             # Call all registered handlers
@@ -122,7 +155,7 @@ class SSEClient:
         """Listen for SSE events from the server."""
         try:
             if self.session is None:
-                self.session = aiohttp.ClientSession()
+                self.session = await _get_session()
             
             url = f"{self.base_url}/events?agent_id={self.agent_id}"
             
@@ -143,19 +176,20 @@ class SSEClient:
                         
                         # Reset reconnect delay on successful connection
                         reconnect_delay = 1
+                        self._ready.set()
                         
-                        # Process the events
-                        buffer = ""
-                        async for line in response.content:
-                            line = line.decode('utf-8')
+                        # Process the events, reading one whole event (up to the
+                        # blank line that terminates it) per await
+                        while not response.content.at_eof():
+                            chunk = await response.content.readuntil(b'\n\n')
                             
                             # Check for ping
-                            if line.startswith(': ping'):
+                            if chunk.startswith(b': ping'):
                                 continue
                             
-                            # Line that starts with 'data: ' contains the event data
-                            if line.startswith('data: '):
-                                data = line[6:].strip()
+                            # Event that starts with 'data: ' contains the event data
+                            if chunk.startswith(b'data: '):
+                                data = chunk[6:].rstrip(b'\r\n')
                                 await self._process_sse_event(data)
                             
                 except asyncio.CancelledError:
@@ -176,8 +210,18 @@ class SSEClient:
     async def start_listening(self):
         """Start listening for SSE events."""
         if self.sse_task is None or self.sse_task.done():
+            self._ready.clear()
             self.sse_task = asyncio.create_task(self._listen_for_events())
-            await asyncio.sleep(1)
+            
+            # Wait until the stream is open, the task has exited, or the
+            # timeout expires; the listener keeps retrying in the background
+            ready = asyncio.create_task(self._ready.wait())
+            await asyncio.wait({ready, self.sse_task}, timeout=READY_TIMEOUT,
+                               return_when=asyncio.FIRST_COMPLETED)
+            ready.cancel()
+            
+            if not self._ready.is_set():
+                logger.warning(f"SSE stream not open after {READY_TIMEOUT}s, continuing startup")
     
     async def stop_listening(self):
         """Stop listening for SSE events."""
@@ -193,7 +237,7 @@ class SSEClient:
         await self.stop_listening()
         
         if self.session is not None:
-            await self.session.close()
+            await _release_session()
             self.session = None
         
         self.is_registered = False